@@ -1,116 +1,196 @@
 """Flask server for Future Wallet financial simulation engine."""
 
-from flask import Flask, render_template, request, jsonify
-
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, List, Literal, Optional
+
+import msgspec
+import orjson
+from flask import Flask, Response, render_template, request
+
+# Importing the engine compiles its Numba kernels (or loads them from the
+# on-disk cache), so the first /api/simulate doesn't wait on the JIT
 from engine.models import (
     UserState, IncomeStream, Expense, Debt, Asset,
-    SimulationResult, DailySnapshot, SimulationEvent,
+    SimulationResult, SimulationEvent,
 )
-from engine.simulator import run_simulation
+from engine.currency import SUPPORTED_CURRENCIES
+from engine.simulator import run_simulation, run_simulations, resume_simulation
 from engine.branching import snapshot, branch, compare
 
 app = Flask(__name__)
 
+# Runs the original and branched continuations of /api/branch side by side
+_branch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="branch")
+
+
+def _json(payload, status: int = 200) -> Response:
+    """Serialize a payload with orjson (NumPy values included)."""
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+# Request schema: decoded straight from the body into typed structs.
+# strict=False decoding keeps accepting numeric strings like "4500".
+
+# Currency codes the engine has exchange rates for
+Currency = Literal[tuple(SUPPORTED_CURRENCIES)]
+
+
+class IncomeStreamDTO(msgspec.Struct):
+    name: str = "Income"
+    amount: float = 0.0
+    currency: Currency = "USD"
+    frequency: str = "monthly"
+    start_day: int = 0
+    end_day: Optional[int] = None
+
+
+class ExpenseDTO(msgspec.Struct):
+    name: str = "Expense"
+    amount: float = 0.0
+    currency: Currency = "USD"
+    frequency: str = "monthly"
+    category: str = "general"
+    start_day: int = 0
+    end_day: Optional[int] = None
+
+
+class DebtDTO(msgspec.Struct):
+    name: str = "Debt"
+    principal: float = 0.0
+    interest_rate: float = 0.0
+    min_payment: float = 0.0
+    currency: Currency = "USD"
+    start_day: int = 0
+
+
+class AssetDTO(msgspec.Struct):
+    name: str = "Asset"
+    value: float = 0.0
+    currency: Currency = "USD"
+    asset_type: Literal["liquid", "yield-generating", "volatile", "illiquid"] = "liquid"
+    volatility: float = 0.0
+    yield_rate: float = 0.0
+    lock_period_days: int = 0
+    sale_penalty_pct: float = 0.0
+
+
+class UserStateDTO(msgspec.Struct):
+    balance: float = 5000.0
+    currency: Currency = "USD"
+    income_streams: List[IncomeStreamDTO] = []
+    expenses: List[ExpenseDTO] = []
+    debts: List[DebtDTO] = []
+    assets: List[AssetDTO] = []
+    credit_score: float = 650.0
+    seed: Annotated[int, msgspec.Meta(ge=0)] = 42  # np.random.default_rng rejects negatives
+    horizon_days: int = 365
+
+
+def _decode_user_state(body: bytes) -> UserStateDTO:
+    """Decode and validate a simulation request body."""
+    return msgspec.json.decode(body, type=UserStateDTO, strict=False)
 
-def _parse_user_state(data: dict) -> UserState:
-    """Parse JSON input into a UserState object."""
-    income_streams = [
-        IncomeStream(
-            name=i.get("name", "Income"),
-            amount=float(i.get("amount", 0)),
-            currency=i.get("currency", "USD"),
-            frequency=i.get("frequency", "monthly"),
-            start_day=int(i.get("start_day", 0)),
-            end_day=int(i["end_day"]) if i.get("end_day") else None,
-        )
-        for i in data.get("income_streams", [])
-    ]
-
-    expenses = [
-        Expense(
-            name=e.get("name", "Expense"),
-            amount=float(e.get("amount", 0)),
-            currency=e.get("currency", "USD"),
-            frequency=e.get("frequency", "monthly"),
-            category=e.get("category", "general"),
-            start_day=int(e.get("start_day", 0)),
-            end_day=int(e["end_day"]) if e.get("end_day") else None,
-        )
-        for e in data.get("expenses", [])
-    ]
-
-    debts = [
-        Debt(
-            name=d.get("name", "Debt"),
-            principal=float(d.get("principal", 0)),
-            interest_rate=float(d.get("interest_rate", 0)),
-            min_payment=float(d.get("min_payment", 0)),
-            currency=d.get("currency", "USD"),
-            start_day=int(d.get("start_day", 0)),
-        )
-        for d in data.get("debts", [])
-    ]
-
-    assets = [
-        Asset(
-            name=a.get("name", "Asset"),
-            value=float(a.get("value", 0)),
-            currency=a.get("currency", "USD"),
-            asset_type=a.get("asset_type", "liquid"),
-            volatility=float(a.get("volatility", 0)),
-            yield_rate=float(a.get("yield_rate", 0)),
-            lock_period_days=int(a.get("lock_period_days", 0)),
-            sale_penalty_pct=float(a.get("sale_penalty_pct", 0)),
-        )
-        for a in data.get("assets", [])
-    ]
 
+def _parse_user_state(dto: UserStateDTO) -> UserState:
+    """Build a UserState from decoded JSON input."""
     return UserState(
-        balance=float(data.get("balance", 5000)),
-        currency=data.get("currency", "USD"),
-        income_streams=income_streams,
-        expenses=expenses,
-        debts=debts,
-        assets=assets,
-        credit_score=float(data.get("credit_score", 650)),
-        seed=int(data.get("seed", 42)),
-        horizon_days=int(data.get("horizon_days", 365)),
+        balance=dto.balance,
+        currency=dto.currency,
+        income_streams=[
+            IncomeStream(
+                name=i.name,
+                amount=i.amount,
+                currency=i.currency,
+                frequency=i.frequency,
+                start_day=i.start_day,
+                end_day=i.end_day or None,
+            )
+            for i in dto.income_streams
+        ],
+        expenses=[
+            Expense(
+                name=e.name,
+                amount=e.amount,
+                currency=e.currency,
+                frequency=e.frequency,
+                category=e.category,
+                start_day=e.start_day,
+                end_day=e.end_day or None,
+            )
+            for e in dto.expenses
+        ],
+        debts=[
+            Debt(
+                name=d.name,
+                principal=d.principal,
+                interest_rate=d.interest_rate,
+                min_payment=d.min_payment,
+                currency=d.currency,
+                start_day=d.start_day,
+            )
+            for d in dto.debts
+        ],
+        assets=[
+            Asset(
+                name=a.name,
+                value=a.value,
+                currency=a.currency,
+                asset_type=a.asset_type,
+                volatility=a.volatility,
+                yield_rate=a.yield_rate,
+                lock_period_days=a.lock_period_days,
+                sale_penalty_pct=a.sale_penalty_pct,
+            )
+            for a in dto.assets
+        ],
+        credit_score=dto.credit_score,
+        seed=dto.seed,
+        horizon_days=dto.horizon_days,
     )
 
 
 def _result_to_json(result: SimulationResult) -> dict:
     """Convert simulation result to JSON-serializable dict."""
     return {
-        "daily_data": [
-            {
-                "day": s.day,
-                "balance": s.balance,
-                "net_worth": s.net_worth,
-                "credit_score": s.credit_score,
-                "nav": s.nav,
-                "liquidity_ratio": s.liquidity_ratio,
-                "total_debt": s.total_debt,
-                "total_assets": s.total_assets,
-            }
-            for s in result.daily_data
-        ],
-        "events": [
-            {
-                "day": e.day,
-                "event_type": e.event_type,
-                "description": e.description,
-                "amount": e.amount,
-                "severity": e.severity,
-            }
-            for e in result.events
-        ],
+        # Column-major: {"day": [...], "balance": [...], ...}
+        "daily_data": result.daily_data.columns(),
+        # orjson serializes the event dataclasses natively, field by field
+        "events": result.events,
         "summary": result.summary,
     }
 
 
-# Store last simulation state for branching
-_last_state = None
-_last_result = None
+# Days between engine checkpoints recorded on /api/simulate
+CHECKPOINT_INTERVAL = 7
+
+# Store last simulation run for branching: a result cache entry (see
+# below), replaced as a whole so a branch never mixes two runs
+_last_run = None
+
+# Recent /api/simulate runs keyed by a hash of the decoded input, so a
+# resubmitted form is answered without re-simulating. Each entry holds
+# (initial state, result, checkpoints, response body); least recently
+# used entries are evicted first.
+RESULT_CACHE_SIZE = 32
+_result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+# Guards _result_cache across request threads; never held while simulating
+_result_cache_lock = threading.Lock()
+
+
+def _input_key(dto: UserStateDTO) -> str:
+    """Content hash of a decoded request; equal inputs give equal keys.
+
+    Hashing the re-encoded struct rather than the raw body makes the key
+    independent of key order, whitespace and omitted defaults.
+    """
+    return hashlib.blake2b(msgspec.json.encode(dto), digest_size=16).hexdigest()
 
 
 @app.route("/")
@@ -120,56 +200,90 @@ def index():
 
 @app.route("/api/simulate", methods=["POST"])
 def simulate():
-    global _last_state, _last_result
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "No JSON data provided"}), 400
-
-    state = _parse_user_state(data)
-    _last_state = snapshot(state)  # save for branching
-    result = run_simulation(state)
-    _last_result = result
-
-    return jsonify(_result_to_json(result))
+    global _last_run
+    body = request.get_data()
+    if not body:
+        return _json({"error": "No JSON data provided"}, 400)
+    try:
+        dto = _decode_user_state(body)
+    except msgspec.MsgspecError as exc:
+        return _json({"error": f"Invalid simulation input: {exc}"}, 400)
+
+    key = _input_key(dto)
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is not None:
+            _result_cache.move_to_end(key)
+    if cached is None:
+        state = _parse_user_state(dto)
+        initial_state = snapshot(state)  # save for branching
+        result = run_simulation(state, checkpoint_every=CHECKPOINT_INTERVAL)
+        checkpoints = {cp.day: cp for cp in result.checkpoints}
+        body = orjson.dumps(_result_to_json(result), option=orjson.OPT_SERIALIZE_NUMPY)
+        cached = (initial_state, result, checkpoints, body)
+        with _result_cache_lock:
+            _result_cache[key] = cached
+            if len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+
+    # Branching only reads the entry (checkpoint states are copied before
+    # use), so it can be shared with the cache
+    _last_run = cached
+    body = cached[3]
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/branch", methods=["POST"])
 def branch_simulation():
-    global _last_state, _last_result
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "No JSON data provided"}), 400
-
-    if _last_state is None:
-        return jsonify({"error": "No simulation has been run yet. Run a simulation first."}), 400
+    try:
+        data = orjson.loads(request.get_data() or b"null")
+    except orjson.JSONDecodeError as exc:
+        return _json({"error": f"Invalid JSON: {exc}"}, 400)
+    if not data or not isinstance(data, dict):
+        return _json({"error": "No JSON data provided"}, 400)
+
+    last_run = _last_run
+    if last_run is None:
+        return _json({"error": "No simulation has been run yet. Run a simulation first."}, 400)
+    last_state, _, last_checkpoints, _ = last_run
 
     branch_day = int(data.get("branch_day", 0))
     modifications = data.get("modifications", {})
-
-    # Re-run original simulation up to branch_day to get exact state
-    original_state = snapshot(_last_state)
-    original_state.horizon_days = branch_day
-    original_partial = run_simulation(original_state)
-
-    # Now original_state has been mutated to the state at branch_day
+    if not 0 <= branch_day <= last_state.horizon_days:
+        return _json({"error": f"branch_day must be between 0 and {last_state.horizon_days}"}, 400)
+
+    # Restore the nearest checkpoint at or before branch_day and replay only
+    # the remaining gap to get the exact state at branch_day
+    checkpoint_day = max(day for day in last_checkpoints if day <= branch_day)
+    checkpoint = last_checkpoints[checkpoint_day]
+    original_state = snapshot(checkpoint.state)
+    if branch_day > checkpoint_day:
+        resume_simulation(original_state, checkpoint, branch_day)
+
+    # Now original_state holds the state at branch_day
     # Create the branched state
-    remaining_days = _last_state.horizon_days - branch_day
+    remaining_days = last_state.horizon_days - branch_day
     original_state.horizon_days = remaining_days
 
-    branched_state = branch(original_state, modifications)
+    try:
+        branched_state = branch(original_state, modifications)
+    except ValueError as exc:
+        return _json({"error": f"Invalid modifications: {exc}"}, 400)
     branched_state.horizon_days = remaining_days
 
-    # Run both from branch point
+    # Run both from branch point; the two continuations share no state
     original_continuation_state = snapshot(original_state)
     # Use different seed section for continuation to avoid correlation
-    original_result = run_simulation(original_continuation_state, start_day=branch_day)
-
-    branched_result = run_simulation(branched_state, start_day=branch_day)
+    original_result, branched_result = run_simulations(
+        [original_continuation_state, branched_state],
+        start_day=branch_day,
+        executor=_branch_executor,
+    )
 
     comparison = compare(original_result, branched_result)
     comparison["branch_day"] = branch_day
 
-    return jsonify(comparison)
+    return _json(comparison)
 
 
 if __name__ == "__main__":
@@ -1 +1,10 @@
 # Future Wallet Engine
+import os
+
+# Kernels are launched from Flask request threads and from both branch
+# workers at once, so the threading layer must be threadsafe (workqueue
+# aborts on concurrent launches). OpenMP goes first: TBB hangs at
+# interpreter exit once its pool was started off the main thread.
+# Numba re-reads its config from the environment, so set it there, before
+# the submodules below this package import Numba.
+os.environ.setdefault("NUMBA_THREADING_LAYER_PRIORITY", "omp tbb workqueue")
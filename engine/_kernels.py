@@ -0,0 +1,457 @@
+"""Compiled (Numba) kernels for the per-day hot path."""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange, types
+
+from .credit import update_credit_score
+from .currency import MIN_RATE
+from .tax import tax_from_table
+
+# Asset or debt counts from which the per-item updates run in parallel;
+# below this the thread fan-out costs more than it saves.
+PARALLEL_MIN_ITEMS = 512
+
+# Running totals carried across simulate_days calls (float64 vector)
+T_BALANCE = 0
+T_CREDIT_SCORE = 1
+T_REALIZED_GAINS = 2
+T_UNREALIZED_GAINS = 3
+T_TAXES_PAID = 4
+T_INCOME = 5
+T_EXPENSES = 6
+N_TOTALS = 7
+
+# Running counters carried across simulate_days calls (int64 vector)
+C_DEFICIT_DAYS = 0
+C_SHOCK_START = 1  # -1 while no shock is in progress
+C_MISSED = 2
+C_DUE = 3
+C_LIQUIDATIONS = 4  # this run's asset sales; not carried over into UserState
+N_COUNTERS = 5
+
+# Event codes in simulate_days' event rows (day, code, item index, amount);
+# the item index points into the debt or asset arrays, -1 if neither
+EV_MISSED_PAYMENT = 0
+EV_DEBT_PAYOFF = 1
+EV_SOLD_ENTIRE = 2
+EV_SOLD_PARTIAL = 3
+EV_BALANCE_NEGATIVE = 4
+EV_TAX = 5
+
+ILLIQUID = 3  # AssetType.ILLIQUID
+
+# Argument types for the explicit kernel signatures below. With a signature
+# Numba compiles (or loads from its cache) at import instead of on the first
+# request, and never recompiles for other argument types: callers must pass
+# exactly these dtypes. Inputs the simulator shares from its caches (the
+# cashflow schedules, the payment-day mask) are read-only.
+_f8 = types.float64[::1]
+_f8_2d = types.float64[:, ::1]
+_f8_2d_ro = types.Array(types.float64, 2, "C", readonly=True)
+_i8 = types.int64[::1]
+_i1 = types.int8[::1]
+_b1 = types.boolean[::1]
+_b1_ro = types.Array(types.boolean, 1, "C", readonly=True)
+
+
+# fastmath stays off: it would let LLVM contract the update into an FMA and
+# round differently from the serial loop in simulate_days, so the same
+# portfolio could drift depending on which path its size picked.
+@njit((_f8, _f8, _f8, types.float64[:]), parallel=True, cache=True)
+def update_assets_kernel(value, daily_volatility, daily_growth, noise):
+    """In-place daily asset update; same arithmetic as simulate_days' serial loop."""
+    for i in prange(value.shape[0]):
+        v = value[i]
+        if v <= 0.0:
+            continue
+        factor = (noise[i] * daily_volatility[i] + 1.0) * daily_growth[i]
+        value[i] = v * factor if factor > 0.0 else 0.0
+
+
+# Veltkamp splitter for float64: 2**27 + 1
+_SPLITTER = 134217729.0
+
+
+@njit(cache=True)
+def _product_error(a, b, product):
+    """Exact rounding error of ``product = a * b`` (Dekker's two-product)."""
+    c = _SPLITTER * a
+    a_hi = c - (c - a)
+    a_lo = a - a_hi
+    c = _SPLITTER * b
+    b_hi = c - (c - b)
+    b_lo = b - b_hi
+    return ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+
+@njit(cache=True)
+def py_round(x, ndigits):
+    """Python's ``round(x, ndigits)``: exact, ties to even.
+
+    Numba's round (like np.round) rounds the float product x * 10**ndigits,
+    which can land exactly on .5 and break the tie differently from Python
+    (15153.595 -> 15153.6 instead of 15153.59). Such ties are settled on the
+    exact product instead.
+    """
+    scale = 10.0 ** ndigits
+    y = x * scale
+    z = np.rint(y)
+    if abs(y - z) == 0.5:
+        error = _product_error(x, scale, y)
+        if error > 0:
+            z = np.ceil(y)
+        elif error < 0:
+            z = np.floor(y)
+    return z / scale
+
+
+@njit((_f8, _f8, _b1, _i8, types.int64), parallel=True, cache=True)
+def accrue_interest_kernel(principal, daily_rate, paid_off, start_day, day):
+    """In-place daily interest on active debts; same arithmetic as simulate_days' serial loop."""
+    for i in prange(principal.shape[0]):
+        if not paid_off[i] and start_day[i] <= day:
+            principal[i] += principal[i] * daily_rate[i]
+
+
+@njit(cache=True)
+def _record(events, n, day, code, index, amount):
+    """Append an event row, growing the buffer when it is full."""
+    if n == events.shape[0]:
+        grown = np.empty((2 * n + 16, 4), dtype=np.float64)
+        grown[:n] = events[:n]
+        events = grown
+    events[n, 0] = day
+    events[n, 1] = code
+    events[n, 2] = index
+    events[n, 3] = amount
+    return events, n + 1
+
+
+@njit(cache=True)
+def _sellable(value, unlock_day, i, day):
+    return value[i] > 0 and day >= unlock_day[i]
+
+
+@njit(cache=True)
+def _asset_totals(value, cost_basis, type_code, unlock_day, day):
+    """(unrealized_gains, total_value, liquid_value) in one pass over the assets."""
+    unrealized = 0.0
+    total = 0.0
+    liquid = 0.0
+    for i in range(value.shape[0]):
+        gain = value[i] - cost_basis[i]
+        if gain > 0.0:
+            unrealized += gain
+        total += value[i]
+        if type_code[i] < ILLIQUID and _sellable(value, unlock_day, i, day):
+            liquid += value[i]
+    return unrealized, total, liquid
+
+
+@njit(cache=True)
+def _debt_total(principal, active, n_active):
+    total = 0.0
+    for k in range(n_active):
+        total += principal[active[k]]
+    return total
+
+
+@njit(cache=True)
+def _drop_paid_off(active, n_active, paid_off):
+    """Remove paid-off debts from ``active[:n_active]``, keeping list order.
+
+    Returns the new count.
+    """
+    kept = 0
+    for k in range(n_active):
+        i = active[k]
+        if not paid_off[i]:
+            active[kept] = i
+            kept += 1
+    return kept
+
+
+@njit(
+    (
+        types.int64, types.int64, types.int64,
+        _f8, _f8, _f8, _f8_2d,
+        _f8_2d_ro, _f8_2d_ro,
+        _f8, _f8, _f8, _i8, _b1,
+        _i8, _i8, _i8, _b1_ro,
+        _f8, _f8, _f8, _i8, _f8,
+        _f8, _i1, _i8, _f8_2d,
+        _f8, _f8, _f8, _f8,
+        _f8, _i8,
+        _i8, _f8, _f8, _f8, _f8,
+        _f8, _f8, _f8,
+        _i8, _i8, _f8_2d,
+    ),
+    cache=True,
+    nogil=True,
+)
+def simulate_days(
+    start_day, n_days, base_ccy,
+    # currency engine state
+    rates, inv_rates, vols, fx_noise,
+    # cashflows due per day and currency
+    income_schedule, expense_schedule,
+    # debts
+    principal, daily_rate, min_payment, debt_start, paid_off,
+    payments_made, payments_due, missed_payments, debt_payment_days,
+    # assets
+    value, daily_volatility, daily_growth, unlock_day, cost_basis,
+    sale_penalty, type_code, liq_order, asset_noise,
+    # tax brackets (see engine.tax._bracket_table)
+    tax_upper, tax_lower, tax_rates, tax_below,
+    # running state, updated in place
+    totals, counters,
+    # outputs: one row per day, shock starts and recovery lengths, and
+    # the (day, code, index, amount) event row buffer
+    out_day, out_balance, out_net_worth, out_credit_score, out_nav,
+    out_liquidity_ratio, out_total_debt, out_total_assets,
+    shock_days, recovery_days, events,
+):
+    """Run the day loop of engine.simulator for days [start_day, start_day + n_days).
+
+    Row ``d`` of every per-day input and output belongs to day
+    ``start_day + d``. Returns (events, n_events, n_shocks, n_recoveries);
+    ``events`` is the buffer passed in, or a larger copy if it filled up.
+    Event rows are decoded into SimulationEvents by the caller.
+    """
+    n_ccy = rates.shape[0]
+    n_debts = principal.shape[0]
+    n_assets = value.shape[0]
+    # Liquidation scratch, allocated once per call: the day loop itself is
+    # plain scalar loops and allocates nothing unless the event buffer grows
+    candidates = np.empty(n_assets, dtype=np.int64)
+    proceeds = np.empty(n_assets, dtype=np.float64)
+    # Debts not yet paid off, in list order (payments go in that order);
+    # compacted on the days a debt is paid off
+    active_debts = np.flatnonzero(~paid_off)
+    n_active = active_debts.shape[0]
+    n_events = 0
+    n_shocks = 0
+    n_recoveries = 0
+
+    balance = totals[T_BALANCE]
+    credit_score = totals[T_CREDIT_SCORE]
+    realized_gains = totals[T_REALIZED_GAINS]
+    unrealized_gains = totals[T_UNREALIZED_GAINS]
+    taxes_paid = totals[T_TAXES_PAID]
+    total_income = totals[T_INCOME]
+    total_expenses = totals[T_EXPENSES]
+    deficit_days = counters[C_DEFICIT_DAYS]
+    shock_start = counters[C_SHOCK_START]
+    total_missed = counters[C_MISSED]
+    total_due = counters[C_DUE]
+    total_liquidations = counters[C_LIQUIDATIONS]
+
+    for d in range(n_days):
+        day = start_day + d
+        liquidation_count = 0
+
+        # ---- Step 1: Exchange rate fluctuations ----
+        for c in range(n_ccy):
+            rate = rates[c] * (1.0 + fx_noise[d, c] * vols[c])
+            if rate < MIN_RATE:
+                rate = MIN_RATE
+            rates[c] = rate
+            inv_rates[c] = 1.0 / rate
+
+        # ---- Steps 2-3: Income and expenses, converted to the base currency ----
+        # The schedules already sum each day's streams per currency, so this
+        # is one conversion per currency with something due, not per stream
+        due_in = 0.0
+        due_out = 0.0
+        any_in = False
+        any_out = False
+        for c in range(n_ccy):
+            amount = income_schedule[d, c]
+            if amount != 0.0:
+                any_in = True
+                due_in += amount * inv_rates[c]
+            amount = expense_schedule[d, c]
+            if amount != 0.0:
+                any_out = True
+                due_out += amount * inv_rates[c]
+        if any_in:
+            amount = due_in * rates[base_ccy]
+            balance += amount
+            total_income += amount
+        if any_out:
+            amount = due_out * rates[base_ccy]
+            balance -= amount
+            total_expenses += amount
+
+        # ---- Step 4: Debt interest, then monthly payments ----
+        # Outstanding debt is summed in the same pass as the accrual and only
+        # re-summed when payments change it. Items are independent (no
+        # reductions), so the parallel path gives the same result; the
+        # totals stay serial to keep sums ordered.
+        if n_debts >= PARALLEL_MIN_ITEMS:
+            accrue_interest_kernel(principal, daily_rate, paid_off, debt_start, day)
+            total_debt = _debt_total(principal, active_debts, n_active)
+        else:
+            total_debt = 0.0
+            for k in range(n_active):
+                i = active_debts[k]
+                if debt_start[i] <= day:
+                    principal[i] += principal[i] * daily_rate[i]
+                total_debt += principal[i]
+        if debt_payment_days[d]:
+            any_paid_off = False
+            for k in range(n_active):
+                i = active_debts[k]
+                if debt_start[i] > day:
+                    continue
+                payments_due[i] += 1
+                total_due += 1
+                p = principal[i]
+                payment = min(min_payment[i], p)
+                if balance >= payment:
+                    balance -= payment
+                    p -= payment
+                    payments_made[i] += 1
+                else:
+                    missed_payments[i] += 1
+                    total_missed += 1
+                    events, n_events = _record(events, n_events, day, EV_MISSED_PAYMENT, i, payment)
+                if p <= 0.01:
+                    p = 0.0
+                    paid_off[i] = True
+                    any_paid_off = True
+                    events, n_events = _record(events, n_events, day, EV_DEBT_PAYOFF, i, 0.0)
+                principal[i] = p
+            if any_paid_off:
+                n_active = _drop_paid_off(active_debts, n_active, paid_off)
+            total_debt = _debt_total(principal, active_debts, n_active)
+
+        # ---- Step 5: Asset valuations ----
+        # Gains and the snapshot totals come out of the same pass; the
+        # totals are redone only if a liquidation changes the values
+        if n_assets >= PARALLEL_MIN_ITEMS:
+            update_assets_kernel(value, daily_volatility, daily_growth, asset_noise[d])
+            unrealized_gains, total_assets, liquid_assets = _asset_totals(
+                value, cost_basis, type_code, unlock_day, day,
+            )
+        else:
+            unrealized_gains = 0.0
+            total_assets = 0.0
+            liquid_assets = 0.0
+            for i in range(n_assets):
+                v = value[i]
+                if v > 0.0:
+                    factor = (asset_noise[d, i] * daily_volatility[i] + 1.0) * daily_growth[i]
+                    v = v * factor if factor > 0.0 else 0.0
+                    value[i] = v
+                gain = v - cost_basis[i]
+                if gain > 0.0:
+                    unrealized_gains += gain
+                total_assets += v
+                if type_code[i] < ILLIQUID and _sellable(value, unlock_day, i, day):
+                    liquid_assets += v
+
+        # ---- Step 6: Deficit -> auto liquidation in priority order ----
+        if balance < 0:
+            deficit = -balance
+            n_candidates = 0
+            for i in liq_order:
+                if _sellable(value, unlock_day, i, day):
+                    candidates[n_candidates] = i
+                    proceeds[n_candidates] = value[i] * (1 - sale_penalty[i])
+                    n_candidates += 1
+            # Sell whole assets while the running proceeds still fit in the
+            # deficit; the first one that overshoots is sold partially
+            recovered = 0.0
+            for k in range(n_candidates):
+                i = candidates[k]
+                cumulative = recovered + proceeds[k]
+                if cumulative <= deficit:
+                    events, n_events = _record(events, n_events, day, EV_SOLD_ENTIRE, i, proceeds[k])
+                    value[i] = 0.0
+                    recovered = cumulative
+                    # Liquidation generates realized gains (simplified: the proceeds)
+                    realized_gains += max(0.0, proceeds[k])
+                    liquidation_count += 1
+                    if cumulative == deficit:
+                        break
+                else:
+                    remaining = deficit - recovered
+                    if remaining > 0:
+                        fraction_needed = remaining / proceeds[k]
+                        value[i] -= value[i] * fraction_needed
+                        cost_basis[i] *= 1 - fraction_needed
+                        events, n_events = _record(events, n_events, day, EV_SOLD_PARTIAL, i, remaining)
+                        recovered += remaining
+                        realized_gains += remaining
+                        liquidation_count += 1
+                    break
+            balance += recovered
+            if liquidation_count:
+                total_liquidations += liquidation_count
+                _, total_assets, liquid_assets = _asset_totals(
+                    value, cost_basis, type_code, unlock_day, day,
+                )
+
+        # Track shocks (balance still negative after liquidation): one test
+        # of the balance per day, and the deficit-day count needs no branch
+        in_deficit = balance < 0
+        deficit_days += in_deficit
+        if in_deficit:
+            events, n_events = _record(events, n_events, day, EV_BALANCE_NEGATIVE, -1, -balance)
+            if shock_start < 0:
+                shock_start = day
+                shock_days[n_shocks] = day
+                n_shocks += 1
+        elif shock_start >= 0:
+            recovery_days[n_recoveries] = day - shock_start
+            n_recoveries += 1
+            shock_start = -1
+
+        # ---- Step 7: Quarterly tax on realized gains ----
+        if day > 0 and day % 90 == 0 and realized_gains > 0:
+            tax_due = tax_from_table(realized_gains, tax_upper, tax_lower, tax_rates, tax_below)
+            tax_increment = tax_due - taxes_paid
+            if tax_increment > 0:
+                balance -= tax_increment
+                taxes_paid = tax_due
+                events, n_events = _record(events, n_events, day, EV_TAX, -1, tax_increment)
+
+        # ---- Step 8: Credit score ----
+        credit_score = update_credit_score(
+            credit_score,
+            total_debt,
+            total_income / max(1, day + 1) * 365,  # annualized income
+            total_missed,
+            max(1, total_due),
+            liquidation_count,
+        )
+
+        # ---- Step 9: Daily snapshot ----
+        # total_debt and total_assets are the values steps 4-8 worked with;
+        # nav is the asset total, so it shares the rounded value
+        nav = py_round(total_assets, 2)
+        out_day[d] = day
+        out_balance[d] = py_round(balance, 2)
+        out_net_worth[d] = py_round(balance + total_assets - total_debt, 2)
+        out_credit_score[d] = py_round(credit_score, 2)
+        out_nav[d] = nav
+        out_liquidity_ratio[d] = py_round(liquid_assets / total_assets if total_assets > 0 else 1.0, 4)
+        out_total_debt[d] = py_round(total_debt, 2)
+        out_total_assets[d] = nav
+
+    totals[T_BALANCE] = balance
+    totals[T_CREDIT_SCORE] = credit_score
+    totals[T_REALIZED_GAINS] = realized_gains
+    totals[T_UNREALIZED_GAINS] = unrealized_gains
+    totals[T_TAXES_PAID] = taxes_paid
+    totals[T_INCOME] = total_income
+    totals[T_EXPENSES] = total_expenses
+    counters[C_DEFICIT_DAYS] = deficit_days
+    counters[C_SHOCK_START] = shock_start
+    counters[C_MISSED] = total_missed
+    counters[C_DUE] = total_due
+    counters[C_LIQUIDATIONS] = total_liquidations
+    return events, n_events, n_shocks, n_recoveries
@@ -1,15 +1,50 @@
 """State snapshotting, what-if branching, and scenario comparison."""
 
 from __future__ import annotations
-import copy
-from typing import Any, Dict, Optional
+from dataclasses import replace
+from typing import Annotated, Any, Dict, Optional
 
-from .models import UserState, SimulationResult, DailySnapshot
+import msgspec
+
+from .models import UserState, SimulationResult
+
+# Daily columns sent back for the side-by-side branch charts
+COMPARE_FIELDS = ("day", "balance", "net_worth", "credit_score", "nav", "liquidity_ratio")
+
+
+def _fast_clone(state: UserState) -> UserState:
+    """Copy a UserState without going through ``copy.deepcopy``.
+
+    Every record holds only scalars, so re-creating each one with
+    ``dataclasses.replace`` and copying the lists is a full deep copy.
+    """
+    return replace(
+        state,
+        income_streams=[replace(i) for i in state.income_streams],
+        expenses=[replace(e) for e in state.expenses],
+        debts=[replace(d) for d in state.debts],
+        assets=[replace(a) for a in state.assets],
+        shock_events=list(state.shock_events),
+        recovery_days=list(state.recovery_days),
+    )
 
 
 def snapshot(state: UserState) -> UserState:
     """Create a deep copy of the entire simulation state."""
-    return copy.deepcopy(state)
+    return _fast_clone(state)
+
+
+# A non-negative integer, as np.random.default_rng requires; the same rule
+# as the seed field of an /api/simulate request
+_Seed = Annotated[int, msgspec.Meta(ge=0)]
+
+
+def _parse_seed(value: Any) -> int:
+    """Validate a seed modification like the /api/simulate seed field."""
+    try:
+        return msgspec.convert(value, _Seed, strict=False)
+    except msgspec.ValidationError as exc:
+        raise ValueError(f"invalid seed {value!r}: {exc}") from None
 
 
 def branch(base_snapshot: UserState, modifications: Dict[str, Any]) -> UserState:
@@ -30,7 +65,7 @@ def branch(base_snapshot: UserState, modifications: Dict[str, Any]) -> UserState
     """
     from .models import IncomeStream, Expense, Debt, Asset
 
-    branched = copy.deepcopy(base_snapshot)
+    branched = _fast_clone(base_snapshot)
 
     if "balance" in modifications:
         branched.balance = modifications["balance"]
@@ -39,7 +74,7 @@ def branch(base_snapshot: UserState, modifications: Dict[str, Any]) -> UserState
         branched.credit_score = modifications["credit_score"]
 
     if "seed" in modifications:
-        branched.seed = modifications["seed"]
+        branched.seed = _parse_seed(modifications["seed"])
 
     if "horizon_days" in modifications:
         branched.horizon_days = modifications["horizon_days"]
@@ -105,18 +140,7 @@ def compare(result_a: SimulationResult, result_b: SimulationResult) -> Dict[str,
             "collapse_probability": _safe_diff("collapse_probability"),
             "shock_resilience_index": _safe_diff("shock_resilience_index"),
         },
-        "original_daily": [_snap_to_dict(s) for s in result_a.daily_data],
-        "branched_daily": [_snap_to_dict(s) for s in result_b.daily_data],
+        "original_daily": result_a.daily_data.columns(COMPARE_FIELDS),
+        "branched_daily": result_b.daily_data.columns(COMPARE_FIELDS),
     }
     return comparison
-
-
-def _snap_to_dict(snap: DailySnapshot) -> dict:
-    return {
-        "day": snap.day,
-        "balance": snap.balance,
-        "net_worth": snap.net_worth,
-        "credit_score": snap.credit_score,
-        "nav": snap.nav,
-        "liquidity_ratio": snap.liquidity_ratio,
-    }
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from numba import njit
+
 SCORE_MIN = 300
 SCORE_MAX = 850
 MAX_DAILY_CHANGE = 2.0
@@ -11,7 +13,15 @@ WEIGHT_DEBT_RATIO = 0.40
 WEIGHT_PUNCTUALITY = 0.35
 WEIGHT_RESTRUCTURING = 0.25
 
+# Weights pre-multiplied by MAX_DAILY_CHANGE so the daily delta is one weighted sum
+_SCALED_DEBT_RATIO = WEIGHT_DEBT_RATIO * MAX_DAILY_CHANGE
+_SCALED_PUNCTUALITY = WEIGHT_PUNCTUALITY * MAX_DAILY_CHANGE
+_SCALED_RESTRUCTURING = WEIGHT_RESTRUCTURING * MAX_DAILY_CHANGE
+
 
+# Compiled so the day loop in engine._kernels can call them directly;
+# still callable from Python
+@njit(cache=True)
 def compute_credit_delta(
     credit_score: float,
     total_debt: float,
@@ -44,7 +54,7 @@ def compute_credit_delta(
         punctuality = 1.0 - (missed_payments / total_payments_due)
     else:
         punctuality = 1.0  # no debts = perfect
-    punct_score = (punctuality - 0.5) * 2  # map [0,1] -> [-1,1]
+    punct_score = punctuality * 2.0 - 1.0  # map [0,1] -> [-1,1]
 
     # --- Restructuring / liquidation factor ---
     if liquidation_events_today > 0:
@@ -52,19 +62,20 @@ def compute_credit_delta(
     else:
         restruct_score = 0.2  # slight positive for stability
 
-    # Weighted sum
-    raw_delta = (
-        WEIGHT_DEBT_RATIO * dti_score
-        + WEIGHT_PUNCTUALITY * punct_score
-        + WEIGHT_RESTRUCTURING * restruct_score
+    # Weighted sum, scaled from [-1, 1] to [-MAX_DAILY_CHANGE, MAX_DAILY_CHANGE]
+    delta = (
+        _SCALED_DEBT_RATIO * dti_score
+        + _SCALED_PUNCTUALITY * punct_score
+        + _SCALED_RESTRUCTURING * restruct_score
     )
-
-    # Scale: raw_delta is in [-1, 1], map to [-MAX_DAILY_CHANGE, MAX_DAILY_CHANGE]
-    delta = raw_delta * MAX_DAILY_CHANGE
-    delta = max(-MAX_DAILY_CHANGE, min(MAX_DAILY_CHANGE, delta))
+    if delta > MAX_DAILY_CHANGE:
+        return MAX_DAILY_CHANGE
+    if delta < -MAX_DAILY_CHANGE:
+        return -MAX_DAILY_CHANGE
     return delta
 
 
+@njit(cache=True)
 def update_credit_score(
     credit_score: float,
     total_debt: float,
@@ -79,4 +90,8 @@ def update_credit_score(
         missed_payments, total_payments_due, liquidation_events_today
     )
     new_score = credit_score + delta
-    return max(SCORE_MIN, min(SCORE_MAX, round(new_score, 2)))
+    if new_score > SCORE_MAX:
+        return float(SCORE_MAX)
+    if new_score < SCORE_MIN:
+        return float(SCORE_MIN)
+    return new_score
@@ -1,8 +1,9 @@
 """Multi-currency exchange rate engine with seeded daily fluctuations."""
 
 from __future__ import annotations
-import random as _random_module
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
 
 # Base rates relative to USD (approximate real-world values)
 BASE_RATES: Dict[str, float] = {
@@ -23,48 +24,40 @@ VOLATILITY: Dict[str, float] = {
 }
 
 SUPPORTED_CURRENCIES = list(BASE_RATES.keys())
+CURRENCY_INDEX: Dict[str, int] = {c: i for i, c in enumerate(SUPPORTED_CURRENCIES)}
+
+# Floor that keeps every rate strictly positive
+MIN_RATE = 0.0001
 
 
 class CurrencyEngine:
-    """Generates deterministic daily exchange rate tables from a seeded RNG."""
+    """Exchange rate state for a run, advanced day by day from seeded noise.
 
-    def __init__(self, rng: _random_module.Random):
-        self.rng = rng
-        # Current rates (USD-relative): how many units of X per 1 USD
-        self.rates: Dict[str, float] = dict(BASE_RATES)
-        self._rate_history: Dict[int, Dict[str, float]] = {}
+    Rates live in ``rates_arr``, one slot per currency in SUPPORTED_CURRENCIES
+    order (see ``idx``); the compiled day loop updates them in place.
+    """
 
-    def advance_day(self, day: int) -> Dict[str, float]:
-        """Generate exchange rates for a new day. Returns rates dict."""
-        for currency in SUPPORTED_CURRENCIES:
-            if currency == "USD":
-                continue
-            vol = VOLATILITY[currency]
-            # Seeded Gaussian fluctuation
-            change = self.rng.gauss(0, vol)
-            self.rates[currency] = round(self.rates[currency] * (1 + change), 6)
-            # Clamp to positive
-            if self.rates[currency] < 0.0001:
-                self.rates[currency] = 0.0001
-        self._rate_history[day] = dict(self.rates)
-        return dict(self.rates)
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.idx = CURRENCY_INDEX
+        start = BASE_RATES if rates is None else rates
+        # Current rates (USD-relative): how many units of X per 1 USD
+        self.rates_arr = np.array([start[c] for c in SUPPORTED_CURRENCIES], dtype=np.float64)
+        # USD per unit of X, kept in step with rates_arr so conversions never divide
+        self.inv_rates_arr = np.reciprocal(self.rates_arr)
+        # USD carries zero volatility, so its rate stays pinned at 1.0
+        self.vols_arr = np.array([VOLATILITY[c] for c in SUPPORTED_CURRENCIES], dtype=np.float64)
 
     def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
         """Convert amount from one currency to another at current day's rate."""
-        if from_currency == to_currency:
-            return round(amount, 6)
         # Convert from_currency -> USD -> to_currency
         # rates[X] = how many X per 1 USD
-        usd_amount = amount / self.rates[from_currency]
-        result = usd_amount * self.rates[to_currency]
-        return round(result, 6)
+        idx = self.idx
+        return float(amount * self.inv_rates_arr[idx[from_currency]] * self.rates_arr[idx[to_currency]])
 
     def get_rate(self, from_currency: str, to_currency: str) -> float:
         """Get current exchange rate from one currency to another."""
-        if from_currency == to_currency:
-            return 1.0
-        usd_from = 1.0 / self.rates[from_currency]
-        return round(usd_from * self.rates[to_currency], 6)
+        idx = self.idx
+        return float(self.inv_rates_arr[idx[from_currency]] * self.rates_arr[idx[to_currency]])
 
     def get_rates_snapshot(self) -> Dict[str, float]:
-        return dict(self.rates)
+        return dict(zip(SUPPORTED_CURRENCIES, self.rates_arr.tolist()))
@@ -0,0 +1,60 @@
+"""Debt arrays for the compiled day loop (see engine._kernels)."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from .models import Debt
+
+
+@dataclass
+class DebtArrays:
+    """Structure-of-arrays view of the debts used by the daily hot path.
+
+    Built once per simulation run from the ``Debt`` list; ``store`` writes
+    the mutable columns back when the run finishes.
+    """
+    names: List[str]
+    principal: np.ndarray
+    daily_rate: np.ndarray  # interest_rate / 365
+    min_payment: np.ndarray
+    start_day: np.ndarray
+    paid_off: np.ndarray
+    total_payments_made: np.ndarray
+    total_payments_due: np.ndarray
+    missed_payments: np.ndarray
+
+    @classmethod
+    def from_debts(cls, debts: List[Debt]) -> "DebtArrays":
+        return cls(
+            names=[d.name for d in debts],
+            principal=np.array([d.principal for d in debts], dtype=np.float64),
+            daily_rate=np.array([d.interest_rate / 365.0 for d in debts], dtype=np.float64),
+            min_payment=np.array([d.min_payment for d in debts], dtype=np.float64),
+            start_day=np.array([d.start_day for d in debts], dtype=np.int64),
+            paid_off=np.array([d.paid_off for d in debts], dtype=np.bool_),
+            total_payments_made=np.array([d.total_payments_made for d in debts], dtype=np.int64),
+            total_payments_due=np.array([d.total_payments_due for d in debts], dtype=np.int64),
+            missed_payments=np.array([d.missed_payments for d in debts], dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def store(self, debts: List[Debt]) -> None:
+        """Write the mutable columns back onto the source ``Debt`` objects."""
+        for debt, principal, paid_off, made, due, missed in zip(
+            debts,
+            self.principal.tolist(),
+            self.paid_off.tolist(),
+            self.total_payments_made.tolist(),
+            self.total_payments_due.tolist(),
+            self.missed_payments.tolist(),
+        ):
+            debt.principal = principal
+            debt.paid_off = paid_off
+            debt.total_payments_made = made
+            debt.total_payments_due = due
+            debt.missed_payments = missed
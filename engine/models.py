@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Union
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class IncomeStream:
     name: str
     amount: float
@@ -15,7 +18,7 @@ class IncomeStream:
     end_day: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     name: str
     amount: float
@@ -26,7 +29,7 @@ class Expense:
     end_day: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Debt:
     name: str
     principal: float
@@ -40,12 +43,35 @@ class Debt:
     total_payments_due: int = 0
 
 
-@dataclass
+class AssetType(IntEnum):
+    """Asset classes, numbered in liquidation priority (most liquid first)."""
+    LIQUID = 0
+    YIELD_GENERATING = 1
+    VOLATILE = 2
+    ILLIQUID = 3
+
+    @property
+    def label(self) -> str:
+        """Name used in the API: liquid, yield-generating, volatile, illiquid."""
+        return self.name.lower().replace("_", "-")
+
+    @classmethod
+    def parse(cls, value: Union[str, int]) -> "AssetType":
+        """Accept an API label, an integer code, or an AssetType."""
+        if isinstance(value, str):
+            try:
+                return cls[value.upper().replace("-", "_")]
+            except KeyError:
+                raise ValueError(f"unknown asset type: {value!r}") from None
+        return cls(value)
+
+
+@dataclass(slots=True)
 class Asset:
     name: str
     value: float
     currency: str = "USD"
-    asset_type: str = "liquid"  # liquid, illiquid, yield-generating, volatile
+    asset_type: AssetType = AssetType.LIQUID  # labels like "yield-generating" are accepted
     volatility: float = 0.0  # 0-1
     yield_rate: float = 0.0  # annual
     lock_period_days: int = 0
@@ -54,11 +80,12 @@ class Asset:
     cost_basis: float = 0.0  # original purchase price for tax purposes
 
     def __post_init__(self):
+        self.asset_type = AssetType.parse(self.asset_type)
         if self.cost_basis == 0.0:
             self.cost_basis = self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class DailySnapshot:
     day: int
     balance: float
@@ -70,7 +97,49 @@ class DailySnapshot:
     total_assets: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
+class DailySeries:
+    """Daily snapshots stored column-wise: one array per DailySnapshot field.
+
+    Row ``i`` is the i-th simulated day; ``series[i]`` rebuilds it as a
+    DailySnapshot.
+    """
+    day: np.ndarray
+    balance: np.ndarray
+    net_worth: np.ndarray
+    credit_score: np.ndarray
+    nav: np.ndarray
+    liquidity_ratio: np.ndarray
+    total_debt: np.ndarray
+    total_assets: np.ndarray
+
+    FIELDS = (
+        "day", "balance", "net_worth", "credit_score", "nav",
+        "liquidity_ratio", "total_debt", "total_assets",
+    )
+
+    @classmethod
+    def empty(cls, days: int) -> "DailySeries":
+        """Allocate columns for ``days`` rows, to be filled in by the simulator."""
+        columns = {name: np.empty(days, dtype=np.float64) for name in cls.FIELDS}
+        columns["day"] = np.empty(days, dtype=np.int64)
+        return cls(**columns)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def __getitem__(self, i: int) -> DailySnapshot:
+        return DailySnapshot(
+            day=int(self.day[i]),
+            **{name: float(getattr(self, name)[i]) for name in self.FIELDS[1:]},
+        )
+
+    def columns(self, names=FIELDS) -> Dict[str, np.ndarray]:
+        """The named columns keyed by field name, e.g. for JSON output."""
+        return {name: getattr(self, name) for name in names}
+
+
+@dataclass(slots=True)
 class SimulationEvent:
     day: int
     event_type: str  # liquidation, deficit, debt_payoff, tax, income, expense, shock
@@ -79,7 +148,28 @@ class SimulationEvent:
     severity: str = "info"  # info, warning, danger, success
 
 
-@dataclass
+@dataclass(slots=True)
+class EventLog:
+    """Simulation events kept as (day, code, index, amount) rows.
+
+    The rows are turned into SimulationEvents by ``decode`` the first time
+    ``events()`` is called, so callers that never look at the events (such
+    as branch comparisons) never build them.
+    """
+    rows: np.ndarray = field(default_factory=lambda: np.empty((0, 4)))
+    decode: Optional[Callable[[np.ndarray], List[SimulationEvent]]] = None
+    _events: Optional[List[SimulationEvent]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def events(self) -> List[SimulationEvent]:
+        if self._events is None:
+            self._events = self.decode(self.rows) if self.decode else []
+        return self._events
+
+
+@dataclass(slots=True)
 class UserState:
     balance: float
     currency: str = "USD"
@@ -103,8 +193,25 @@ class UserState:
     current_shock_start: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class Checkpoint:
+    """Engine state at the start of ``day``: enough to resume a run exactly."""
+    day: int
+    state: UserState
+    fx_rates: Dict[str, float]
+    # The run's pre-drawn noise rows from ``day`` on (views, not copies)
+    fx_noise: np.ndarray
+    asset_noise: np.ndarray
+
+
+@dataclass(slots=True)
 class SimulationResult:
-    daily_data: List[DailySnapshot] = field(default_factory=list)
-    events: List[SimulationEvent] = field(default_factory=list)
+    daily_data: DailySeries = field(default_factory=lambda: DailySeries.empty(0))
+    event_log: EventLog = field(default_factory=EventLog)
     summary: dict = field(default_factory=dict)
+    checkpoints: List[Checkpoint] = field(default_factory=list)
+
+    @property
+    def events(self) -> List[SimulationEvent]:
+        """The run's events, decoded on first access."""
+        return self.event_log.events()
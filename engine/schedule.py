@@ -0,0 +1,68 @@
+"""Precomputed per-day cashflow schedules for recurring streams."""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .currency import CURRENCY_INDEX, SUPPORTED_CURRENCIES
+from .models import Expense, IncomeStream
+
+# Payment period in days per frequency; anything else never pays out
+PAYMENT_PERIODS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+# (amount, currency, frequency, start_day, end_day)
+StreamKey = Tuple[float, str, str, int, Optional[int]]
+
+
+def stream_keys(streams: Iterable[Union[IncomeStream, Expense]]) -> Tuple[StreamKey, ...]:
+    """Hashable description of the streams, used as the schedule cache key."""
+    return tuple(
+        (s.amount, s.currency, s.frequency, s.start_day, s.end_day) for s in streams
+    )
+
+
+@lru_cache(maxsize=64)
+def payment_day_mask(frequency: str, start_day: int, horizon_days: int) -> np.ndarray:
+    """Boolean per day: True where a ``frequency`` payment falls due.
+
+    Row ``d`` covers day ``start_day + d``, with the same absolute-day rule
+    as build_cashflow_schedule. Cached and read-only.
+    """
+    days = np.arange(start_day, start_day + max(0, horizon_days))
+    period = PAYMENT_PERIODS.get(frequency)
+    mask = np.zeros(days.shape, dtype=np.bool_) if period is None else days % period == 0
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=64)
+def build_cashflow_schedule(
+    streams: Tuple[StreamKey, ...], start_day: int, horizon_days: int,
+) -> np.ndarray:
+    """Amount due per day and currency from a set of income streams or expenses.
+
+    Row ``d`` covers day ``start_day + d``; columns follow
+    SUPPORTED_CURRENCIES, so a day's total in any currency is one dot
+    product with that day's conversion rates. Payment days use absolute day
+    numbers (weekly on multiples of 7, monthly on multiples of 30), so each
+    stream fills a strided slice of its column.
+
+    The result is cached and shared between runs, so it is read-only.
+    """
+    horizon_days = max(0, horizon_days)
+    schedule = np.zeros((horizon_days, len(SUPPORTED_CURRENCIES)), dtype=np.float64)
+    window_end = start_day + horizon_days - 1
+    for amount, currency, frequency, first_day, last_day in streams:
+        period = PAYMENT_PERIODS.get(frequency)
+        if period is None:
+            continue
+        first = max(first_day, start_day)
+        first += -first % period  # round up to the next payment day
+        last = window_end if last_day is None else min(last_day, window_end)
+        if first > last:
+            continue
+        schedule[first - start_day:last - start_day + 1:period, CURRENCY_INDEX[currency]] += amount
+    schedule.flags.writeable = False
+    return schedule
@@ -1,43 +1,75 @@
 """Core day-by-day deterministic simulation loop."""
 
 from __future__ import annotations
-import random as _random_module
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from typing import List, Optional
 
+import numpy as np
+
 from .models import (
-    UserState, DailySnapshot, SimulationEvent, SimulationResult,
-    IncomeStream, Expense, Debt, Asset,
+    UserState, AssetType, DailySeries, EventLog, SimulationEvent, SimulationResult,
+    Checkpoint,
 )
-from .currency import CurrencyEngine
-from .credit import update_credit_score
-from .tax import calculate_tax
-from .assets import (
-    update_asset_values, get_total_asset_value,
-    get_liquid_asset_value, get_liquidity_ratio,
-    liquidate_to_cover,
+from .currency import CurrencyEngine, SUPPORTED_CURRENCIES
+from .tax import bracket_table
+from .schedule import build_cashflow_schedule, payment_day_mask, stream_keys
+from .debts import DebtArrays
+from .branching import snapshot as snapshot_state
+from .assets import AssetArrays
+from ._kernels import (
+    simulate_days,
+    N_TOTALS, T_BALANCE, T_CREDIT_SCORE, T_REALIZED_GAINS, T_UNREALIZED_GAINS,
+    T_TAXES_PAID, T_INCOME, T_EXPENSES,
+    N_COUNTERS, C_DEFICIT_DAYS, C_SHOCK_START, C_MISSED, C_DUE, C_LIQUIDATIONS,
+    EV_MISSED_PAYMENT, EV_DEBT_PAYOFF, EV_SOLD_ENTIRE, EV_SOLD_PARTIAL,
+    EV_BALANCE_NEGATIVE, EV_TAX,
 )
 
-
-def _is_payment_day(day: int, frequency: str) -> bool:
-    """Check if a payment/income is due on this day based on frequency."""
-    if frequency == "daily":
-        return True
-    if frequency == "weekly":
-        return day % 7 == 0
-    if frequency == "monthly":
-        return day % 30 == 0
-    return False
+# Summary "financial_vibe" and "pet_state" per vibe bucket, worst first
+VIBE_COLLAPSED, VIBE_CRITICAL, VIBE_STRESSED, VIBE_STABLE, VIBE_THRIVING = range(5)
+VIBES = (
+    ("\U0001f480 Collapsed", "Ghost \U0001f47b"),
+    ("\U0001f525 Critical", "Phoenix Rising \U0001f525"),
+    ("\U0001f630 Stressed", "Hibernating Bear \U0001f43b"),
+    ("\U0001f60a Stable", "Nervous Dog \U0001f436"),
+    ("\U0001f680 Thriving", "Happy Cat \U0001f431"),
+)
 
 
-def _in_active_range(day: int, start_day: int, end_day: Optional[int]) -> bool:
-    if day < start_day:
-        return False
-    if end_day is not None and day > end_day:
-        return False
-    return True
+def _make_checkpoint(
+    day: int,
+    state: UserState,
+    assets: AssetArrays,
+    debts: DebtArrays,
+    currency_engine: CurrencyEngine,
+    fx_noise: np.ndarray,
+    asset_noise: np.ndarray,
+    **progress,
+) -> Checkpoint:
+    """Capture an in-flight run so it can be resumed exactly from ``day``.
+
+    ``fx_noise``/``asset_noise`` are the run's noise rows from ``day`` on;
+    ``progress`` holds the UserState fields the loop keeps in locals.
+    """
+    cp_state = snapshot_state(state)
+    assets.store(cp_state.assets)
+    debts.store(cp_state.debts)
+    for name, value in progress.items():
+        setattr(cp_state, name, value)
+    return Checkpoint(
+        day=day,
+        state=cp_state,
+        fx_rates=currency_engine.get_rates_snapshot(),
+        fx_noise=fx_noise,
+        asset_noise=asset_noise,
+    )
 
 
-def run_simulation(state: UserState, start_day: int = 0) -> SimulationResult:
+def run_simulation(
+    state: UserState, start_day: int = 0, checkpoint_every: int = 0,
+) -> SimulationResult:
     """Run the full deterministic day-by-day simulation.
 
     DAG order per day:
@@ -51,200 +83,171 @@ def run_simulation(state: UserState, start_day: int = 0) -> SimulationResult:
         8. Update credit score
         9. Record daily snapshot
 
+    All randomness is drawn from the seeded RNG up front as one row per
+    simulated day (currencies first, then assets), so a day's noise does
+    not depend on how long the run is.
+
     Args:
         state: The UserState with all inputs and parameters.
         start_day: The day number to start from (for branching support).
+        checkpoint_every: If positive, record a Checkpoint at ``start_day``
+            and then every ``checkpoint_every`` days (see resume_simulation).
 
     Returns:
-        SimulationResult with daily data, events, and summary.
+        SimulationResult with daily data, events, summary and checkpoints.
     """
-    rng = _random_module.Random(state.seed)
-    currency_engine = CurrencyEngine(rng)
+    horizon = max(0, state.horizon_days)
+    rng = np.random.default_rng(state.seed)
+    n_currencies = len(SUPPORTED_CURRENCIES)
+    noise = rng.standard_normal((horizon, n_currencies + len(state.assets)))
+    # Split into C-contiguous blocks once, so every day range handed to the
+    # kernel (and every checkpoint's remainder) is a plain row slice
+    fx_noise = np.ascontiguousarray(noise[:, :n_currencies])
+    asset_noise = np.ascontiguousarray(noise[:, n_currencies:])
+    currency_engine = CurrencyEngine()
+    return _simulate(
+        state, start_day, start_day + horizon,
+        currency_engine, fx_noise, asset_noise, checkpoint_every,
+    )
 
-    daily_data: List[DailySnapshot] = []
-    events: List[SimulationEvent] = []
 
-    balance = state.balance
-    credit_score = state.credit_score
-    realized_gains = state.realized_gains
-    unrealized_gains = 0.0
-    taxes_paid = state.taxes_paid
-    total_income_received = state.total_income_received
-    total_expenses_paid = state.total_expenses_paid
-    deficit_days = state.deficit_days
-    shock_events = list(state.shock_events)
-    recovery_days = list(state.recovery_days)
-    current_shock_start = state.current_shock_start
+def run_simulations(
+    states: List[UserState], start_day: int = 0, executor: Optional[Executor] = None,
+) -> List[SimulationResult]:
+    """Run independent scenarios concurrently; results come back in ``states`` order.
 
-    # Track total missed / due for credit calculation
-    total_missed = sum(d.missed_payments for d in state.debts)
-    total_due = sum(d.total_payments_due for d in state.debts)
-
-    end_day = start_day + state.horizon_days
-
-    for day in range(start_day, end_day):
-        day_events: List[SimulationEvent] = []
-        liquidation_count = 0
-
-        # ---- Step 1: Exchange rate fluctuations ----
-        currency_engine.advance_day(day)
-
-        # ---- Step 2: Credit income streams ----
-        for inc in state.income_streams:
-            if not _in_active_range(day, inc.start_day, inc.end_day):
-                continue
-            if _is_payment_day(day, inc.frequency):
-                amount_in_base = currency_engine.convert(
-                    inc.amount, inc.currency, state.currency
-                )
-                balance += amount_in_base
-                total_income_received += amount_in_base
-
-        # ---- Step 3: Deduct expenses ----
-        for exp in state.expenses:
-            if not _in_active_range(day, exp.start_day, exp.end_day):
-                continue
-            if _is_payment_day(day, exp.frequency):
-                amount_in_base = currency_engine.convert(
-                    exp.amount, exp.currency, state.currency
-                )
-                balance -= amount_in_base
-                total_expenses_paid += amount_in_base
-
-        # ---- Step 4: Process debt payments ----
-        for debt in state.debts:
-            if debt.paid_off:
-                continue
-            if not _in_active_range(day, debt.start_day, None):
-                continue
-
-            # Accrue daily interest
-            daily_rate = debt.interest_rate / 365.0
-            interest = debt.principal * daily_rate
-            debt.principal = round(debt.principal + interest, 6)
-
-            # Monthly payments
-            if _is_payment_day(day, "monthly"):
-                debt.total_payments_due += 1
-                total_due += 1
-                payment = min(debt.min_payment, debt.principal)
-
-                if balance >= payment:
-                    balance -= payment
-                    debt.principal = round(debt.principal - payment, 6)
-                    debt.total_payments_made += 1
-                else:
-                    # Missed payment
-                    debt.missed_payments += 1
-                    total_missed += 1
-                    day_events.append(SimulationEvent(
-                        day=day,
-                        event_type="deficit",
-                        description=f"Missed payment on {debt.name} (owed {payment:.2f})",
-                        amount=payment,
-                        severity="danger",
-                    ))
-
-                # Check if debt is paid off
-                if debt.principal <= 0.01:
-                    debt.principal = 0.0
-                    debt.paid_off = True
-                    day_events.append(SimulationEvent(
-                        day=day,
-                        event_type="debt_payoff",
-                        description=f"Paid off {debt.name}!",
-                        amount=0,
-                        severity="success",
-                    ))
-
-        # ---- Step 5: Update asset valuations ----
-        old_asset_total = get_total_asset_value(state.assets)
-        update_asset_values(state.assets, rng, day)
-        new_asset_total = get_total_asset_value(state.assets)
-        unrealized_gains = sum(
-            max(0, a.value - a.cost_basis) for a in state.assets
-        )
+    The day loop releases the GIL, so scenarios run on threads and share the
+    compiled kernels with no pickling. Each state is advanced in place as in
+    run_simulation, so the states must not share mutable parts (use
+    branching.snapshot copies). Runs on ``executor`` if given, otherwise on
+    a thread pool created for the call with at most one thread per CPU.
+    """
+    run = partial(run_simulation, start_day=start_day)
+    if executor is not None:
+        return list(executor.map(run, states))
+    with ThreadPoolExecutor(max_workers=max(1, min(len(states), os.cpu_count() or 1))) as pool:
+        return list(pool.map(run, states))
 
-        # ---- Step 6: Check deficit -> auto liquidation ----
-        if balance < 0:
-            deficit_amount = abs(balance)
-            recovered, liq_events = liquidate_to_cover(
-                state.assets, deficit_amount, day
-            )
-            balance += recovered
-            # Liquidation generates realized gains
-            for ev in liq_events:
-                realized_gains += max(0, ev.amount)  # simplified
-            liquidation_count += len(liq_events)
-            day_events.extend(liq_events)
-
-            if balance < 0:
-                day_events.append(SimulationEvent(
-                    day=day,
-                    event_type="deficit",
-                    description=f"Balance negative: {balance:.2f} (insufficient assets to cover)",
-                    amount=abs(balance),
-                    severity="danger",
-                ))
-
-        # Track shocks (balance going negative)
-        if balance < 0:
-            deficit_days += 1
-            if current_shock_start is None:
-                current_shock_start = day
-                shock_events.append(day)
-        else:
-            if current_shock_start is not None:
-                recovery_days.append(day - current_shock_start)
-                current_shock_start = None
-
-        # ---- Step 7: Taxes on realized gains (annual settlement, simplified daily accrual) ----
-        # We track realized gains; taxes are computed at the end for summary
-        # but we can also do periodic tax deductions (e.g., quarterly)
-        if day > 0 and day % 90 == 0 and realized_gains > 0:
-            tax_due = calculate_tax(realized_gains)
-            tax_increment = tax_due - taxes_paid
-            if tax_increment > 0:
-                balance -= tax_increment
-                taxes_paid = tax_due
-                day_events.append(SimulationEvent(
-                    day=day,
-                    event_type="tax",
-                    description=f"Quarterly tax payment: {tax_increment:.2f}",
-                    amount=tax_increment,
-                    severity="info",
-                ))
-
-        # ---- Step 8: Update credit score ----
-        total_debt_value = sum(d.principal for d in state.debts if not d.paid_off)
-        credit_score = update_credit_score(
-            credit_score,
-            total_debt_value,
-            total_income_received / max(1, day + 1) * 365,  # annualized income
-            total_missed,
-            max(1, total_due),
-            liquidation_count,
-        )
 
-        # ---- Step 9: Record daily snapshot ----
-        total_assets = get_total_asset_value(state.assets)
-        total_debts = sum(d.principal for d in state.debts if not d.paid_off)
-        net_worth = balance + total_assets - total_debts
-        nav = total_assets
-        liq_ratio = get_liquidity_ratio(state.assets, day)
-
-        snapshot = DailySnapshot(
-            day=day,
-            balance=round(balance, 2),
-            net_worth=round(net_worth, 2),
-            credit_score=round(credit_score, 2),
-            nav=round(nav, 2),
-            liquidity_ratio=round(liq_ratio, 4),
-            total_debt=round(total_debts, 2),
-            total_assets=round(total_assets, 2),
+def resume_simulation(state: UserState, checkpoint: Checkpoint, end_day: int) -> SimulationResult:
+    """Replay days ``[checkpoint.day, end_day)`` exactly as the original run did.
+
+    ``state`` must be a copy of ``checkpoint.state``; it is advanced in place
+    just like in run_simulation. The checkpoint itself is left untouched.
+    ``end_day`` cannot go past the end of the original run, since only that
+    run's noise is available.
+    """
+    days = end_day - checkpoint.day
+    if days > checkpoint.fx_noise.shape[0]:
+        raise ValueError(f"cannot resume past day {checkpoint.day + checkpoint.fx_noise.shape[0]}")
+    currency_engine = CurrencyEngine(rates=checkpoint.fx_rates)
+    return _simulate(
+        state, checkpoint.day, end_day, currency_engine,
+        checkpoint.fx_noise[:days], checkpoint.asset_noise[:days],
+    )
+
+
+def _simulate(
+    state: UserState,
+    start_day: int,
+    end_day: int,
+    currency_engine: CurrencyEngine,
+    fx_noise: np.ndarray,
+    asset_noise: np.ndarray,
+    checkpoint_every: int = 0,
+) -> SimulationResult:
+    """Simulate days ``[start_day, end_day)``; see run_simulation.
+
+    Row ``day - start_day`` of each noise array drives that day. The day
+    loop itself runs compiled in ``_kernels.simulate_days``, one call per
+    checkpoint interval (or one call for the whole run).
+    """
+    n_days = end_day - start_day
+    assets = AssetArrays.from_assets(state.assets)
+    debts = DebtArrays.from_debts(state.debts)
+    checkpoints: List[Checkpoint] = []
+    if checkpoint_every > 0:
+        checkpoints.append(_make_checkpoint(
+            start_day, state, assets, debts, currency_engine, fx_noise, asset_noise,
+        ))
+
+    daily_data = DailySeries.empty(n_days)
+    event_rows: List[np.ndarray] = []
+
+    totals = np.zeros(N_TOTALS, dtype=np.float64)
+    totals[T_BALANCE] = state.balance
+    totals[T_CREDIT_SCORE] = state.credit_score
+    totals[T_REALIZED_GAINS] = state.realized_gains
+    totals[T_TAXES_PAID] = state.taxes_paid
+    totals[T_INCOME] = state.total_income_received
+    totals[T_EXPENSES] = state.total_expenses_paid
+    counters = np.zeros(N_COUNTERS, dtype=np.int64)
+    counters[C_DEFICIT_DAYS] = state.deficit_days
+    counters[C_SHOCK_START] = -1 if state.current_shock_start is None else state.current_shock_start
+    # Track total missed / due for credit calculation
+    counters[C_MISSED] = debts.missed_payments.sum()
+    counters[C_DUE] = debts.total_payments_due.sum()
+
+    # Cashflows due per day and currency, shared across runs with the same streams
+    income_schedule = build_cashflow_schedule(
+        stream_keys(state.income_streams), start_day, n_days
+    )
+    expense_schedule = build_cashflow_schedule(
+        stream_keys(state.expenses), start_day, n_days
+    )
+    # Debt payments fall due monthly
+    debt_payment_days = payment_day_mask("monthly", start_day, n_days)
+    tax_upper, tax_lower, tax_rates, tax_below = bracket_table()
+    base_ccy = currency_engine.idx[state.currency]
+    # Shock start days and recovery lengths of this run; each segment writes
+    # on from the previous one's cursor (a run has at most one per day)
+    shock_buf = np.empty(n_days, dtype=np.int64)
+    recovery_buf = np.empty(n_days, dtype=np.int64)
+    n_shocks = n_recoveries = 0
+    # Event rows, reused by every segment; sized for about one event a day
+    # and grown by the kernel if a run produces more
+    event_buf = np.empty((max(16, n_days), 4), dtype=np.float64)
+
+    step = checkpoint_every if checkpoint_every > 0 else max(1, n_days)
+    for seg_start in range(start_day, end_day, step):
+        seg_end = min(seg_start + step, end_day)
+        rows = slice(seg_start - start_day, seg_end - start_day)
+        event_buf, n_events, seg_shocks, seg_recoveries = simulate_days(
+            seg_start, seg_end - seg_start, base_ccy,
+            currency_engine.rates_arr, currency_engine.inv_rates_arr,
+            currency_engine.vols_arr, fx_noise[rows],
+            income_schedule[rows], expense_schedule[rows],
+            debts.principal, debts.daily_rate, debts.min_payment, debts.start_day,
+            debts.paid_off, debts.total_payments_made, debts.total_payments_due,
+            debts.missed_payments, debt_payment_days[rows],
+            assets.value, assets.daily_volatility, assets.daily_growth,
+            assets.unlock_day, assets.cost_basis,
+            assets.sale_penalty_pct, assets.type_code, assets.liq_order,
+            asset_noise[rows],
+            tax_upper, tax_lower, tax_rates, tax_below,
+            totals, counters,
+            *(column[rows] for column in daily_data.columns().values()),
+            shock_buf[n_shocks:], recovery_buf[n_recoveries:], event_buf,
         )
-        daily_data.append(snapshot)
-        events.extend(day_events)
+        event_rows.append(event_buf[:n_events].copy())
+        n_shocks += seg_shocks
+        n_recoveries += seg_recoveries
+
+        if checkpoint_every > 0 and (seg_end - start_day) % checkpoint_every == 0:
+            checkpoints.append(_make_checkpoint(
+                seg_end, state, assets, debts, currency_engine,
+                fx_noise[seg_end - start_day:], asset_noise[seg_end - start_day:],
+                **_progress(totals, counters, state, shock_buf[:n_shocks], recovery_buf[:n_recoveries]),
+            ))
+
+    progress = _progress(totals, counters, state, shock_buf[:n_shocks], recovery_buf[:n_recoveries])
+    events = np.concatenate(event_rows) if event_rows else np.empty((0, 4))
+    realized_gains = progress["realized_gains"]
+    unrealized_gains = float(totals[T_UNREALIZED_GAINS])
+    taxes_paid = progress["taxes_paid"]
+    total_income_received = progress["total_income_received"]
+    total_expenses_paid = progress["total_expenses_paid"]
+    deficit_days = progress["deficit_days"]
 
     # ---- Build summary ----
     horizon = state.horizon_days
@@ -253,44 +256,22 @@ def run_simulation(state: UserState, start_day: int = 0) -> SimulationResult:
     collapse_prob = round(deficit_days / max(1, total_days) * 100, 2)
 
     # First deficit day
-    first_deficit = None
-    for snap in daily_data:
-        if snap.balance < 0:
-            first_deficit = snap.day
-            break
-
-    # Financial vibe
-    balance_volatility = _compute_volatility(daily_data)
+    deficit_rows = np.flatnonzero(daily_data.balance < 0)
+    first_deficit = int(daily_data.day[deficit_rows[0]]) if deficit_rows.size else None
+
+    # Financial vibe and pet state
     if final and final.balance > 0 and collapse_prob == 0:
-        if balance_volatility < 0.05:
-            vibe = "Thriving"
-            vibe_emoji = "\U0001f680"
-        else:
-            vibe = "Stable"
-            vibe_emoji = "\U0001f60a"
+        vibe_bucket = VIBE_THRIVING if _compute_volatility(daily_data) < 0.05 else VIBE_STABLE
     elif collapse_prob < 20:
-        vibe = "Stressed"
-        vibe_emoji = "\U0001f630"
+        vibe_bucket = VIBE_STRESSED
     elif collapse_prob < 50:
-        vibe = "Critical"
-        vibe_emoji = "\U0001f525"
+        vibe_bucket = VIBE_CRITICAL
     else:
-        vibe = "Collapsed"
-        vibe_emoji = "\U0001f480"
-
-    # Pet state
-    if vibe == "Thriving":
-        pet = "Happy Cat \U0001f431"
-    elif vibe == "Stable":
-        pet = "Nervous Dog \U0001f436"
-    elif vibe == "Stressed":
-        pet = "Hibernating Bear \U0001f43b"
-    elif vibe == "Critical":
-        pet = "Phoenix Rising \U0001f525"
-    else:
-        pet = "Ghost \U0001f47b"
+        vibe_bucket = VIBE_COLLAPSED
+    vibe, pet = VIBES[vibe_bucket]
 
     # Shock resilience index (0-100)
+    recovery_days = progress["recovery_days"]
     if len(recovery_days) > 0:
         avg_recovery = sum(recovery_days) / len(recovery_days)
         sri = max(0, min(100, round(100 - avg_recovery * 2, 2)))
@@ -302,10 +283,10 @@ def run_simulation(state: UserState, start_day: int = 0) -> SimulationResult:
     summary = {
         "final_balance": final.balance if final else 0,
         "final_net_worth": final.net_worth if final else 0,
-        "final_credit_score": final.credit_score if final else state.credit_score,
+        "final_credit_score": final.credit_score if final else round(state.credit_score, 2),
         "collapse_probability": collapse_prob,
         "collapse_timing": first_deficit,
-        "financial_vibe": f"{vibe_emoji} {vibe}",
+        "financial_vibe": vibe,
         "pet_state": pet,
         "shock_resilience_index": sri,
         "total_income": round(total_income_received, 2),
@@ -313,37 +294,114 @@ def run_simulation(state: UserState, start_day: int = 0) -> SimulationResult:
         "total_taxes_paid": round(taxes_paid, 2),
         "realized_gains": round(realized_gains, 2),
         "unrealized_gains": round(unrealized_gains, 2),
-        "total_liquidation_events": sum(1 for e in events if e.event_type == "liquidation"),
+        "total_liquidation_events": int(counters[C_LIQUIDATIONS]),
         "deficit_days": deficit_days,
     }
 
     # Update state for potential branching
-    state.balance = balance
-    state.credit_score = credit_score
-    state.realized_gains = realized_gains
-    state.taxes_paid = taxes_paid
-    state.total_income_received = total_income_received
-    state.total_expenses_paid = total_expenses_paid
-    state.deficit_days = deficit_days
-    state.shock_events = shock_events
-    state.recovery_days = recovery_days
-    state.current_shock_start = current_shock_start
+    assets.store(state.assets)
+    debts.store(state.debts)
+    for name, value in progress.items():
+        setattr(state, name, value)
 
     return SimulationResult(
         daily_data=daily_data,
-        events=events,
+        event_log=EventLog(events, partial(_decode_events, assets=assets, debts=debts)),
         summary=summary,
+        checkpoints=checkpoints,
     )
 
 
-def _compute_volatility(daily_data: List[DailySnapshot]) -> float:
+def _progress(
+    totals: np.ndarray,
+    counters: np.ndarray,
+    state: UserState,
+    shocks: np.ndarray,
+    recoveries: np.ndarray,
+) -> dict:
+    """UserState running fields from the kernel's totals and counters.
+
+    ``shocks``/``recoveries`` are the run's new entries, appended to those
+    ``state`` started with.
+    """
+    shock_start = int(counters[C_SHOCK_START])
+    return dict(
+        balance=float(totals[T_BALANCE]),
+        credit_score=float(totals[T_CREDIT_SCORE]),
+        realized_gains=float(totals[T_REALIZED_GAINS]),
+        taxes_paid=float(totals[T_TAXES_PAID]),
+        total_income_received=float(totals[T_INCOME]),
+        total_expenses_paid=float(totals[T_EXPENSES]),
+        deficit_days=int(counters[C_DEFICIT_DAYS]),
+        shock_events=state.shock_events + shocks.tolist(),
+        recovery_days=state.recovery_days + recoveries.tolist(),
+        current_shock_start=None if shock_start < 0 else shock_start,
+    )
+
+
+def _decode_events(rows: np.ndarray, assets: AssetArrays, debts: DebtArrays) -> List[SimulationEvent]:
+    """Turn simulate_days event rows back into SimulationEvents."""
+    events: List[SimulationEvent] = []
+    for day, code, index, amount in rows.tolist():
+        day, code, i = int(day), int(code), int(index)
+        if code == EV_MISSED_PAYMENT:
+            events.append(SimulationEvent(
+                day=day,
+                event_type="deficit",
+                description=f"Missed payment on {debts.names[i]} (owed {amount:.2f})",
+                amount=amount,
+                severity="danger",
+            ))
+        elif code == EV_DEBT_PAYOFF:
+            events.append(SimulationEvent(
+                day=day,
+                event_type="debt_payoff",
+                description=f"Paid off {debts.names[i]}!",
+                amount=0,
+                severity="success",
+            ))
+        elif code == EV_SOLD_ENTIRE:
+            penalty = float(assets.sale_penalty_pct[i])
+            events.append(SimulationEvent(
+                day=day,
+                event_type="liquidation",
+                description=f"Sold entire {assets.names[i]} ({AssetType(assets.type_code[i]).label}) for {amount:.2f} (penalty: {penalty*100:.0f}%)",
+                amount=amount,
+                severity="warning",
+            ))
+        elif code == EV_SOLD_PARTIAL:
+            events.append(SimulationEvent(
+                day=day,
+                event_type="liquidation",
+                description=f"Partially sold {assets.names[i]} ({AssetType(assets.type_code[i]).label}) for {amount:.2f}",
+                amount=amount,
+                severity="warning",
+            ))
+        elif code == EV_BALANCE_NEGATIVE:
+            events.append(SimulationEvent(
+                day=day,
+                event_type="deficit",
+                description=f"Balance negative: {-amount:.2f} (insufficient assets to cover)",
+                amount=amount,
+                severity="danger",
+            ))
+        elif code == EV_TAX:
+            events.append(SimulationEvent(
+                day=day,
+                event_type="tax",
+                description=f"Quarterly tax payment: {amount:.2f}",
+                amount=amount,
+                severity="info",
+            ))
+    return events
+
+
+def _compute_volatility(daily_data: DailySeries) -> float:
     """Compute coefficient of variation of daily balances."""
     if len(daily_data) < 2:
         return 0.0
-    balances = [s.balance for s in daily_data]
-    mean = sum(balances) / len(balances)
+    balances = daily_data.balance
+    mean = balances.mean()
     if mean == 0:
         return 1.0
-    variance = sum((b - mean) ** 2 for b in balances) / len(balances)
-    std = variance ** 0.5
-    return abs(std / mean)
+    return abs(float(balances.std()) / float(mean))
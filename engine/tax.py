@@ -1,7 +1,14 @@
 """Progressive tax bracket system for realized gains."""
 
 from __future__ import annotations
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+import numpy as np
+from numba import njit
+
+# Stand-in for an unbounded top bracket that keeps the tables float64-finite
+TOP_BRACKET_BOUND = 1e18
 
 # US-style progressive brackets (annual income thresholds, rate)
 DEFAULT_BRACKETS: List[Tuple[float, float]] = [
@@ -9,45 +16,74 @@ DEFAULT_BRACKETS: List[Tuple[float, float]] = [
     (40_000, 0.12),
     (85_000, 0.22),
     (165_000, 0.24),
-    (float("inf"), 0.32),
+    (TOP_BRACKET_BOUND, 0.32),
 ]
 
 
-def calculate_tax(realized_gains: float, brackets: List[Tuple[float, float]] = None) -> float:
-    """Calculate progressive tax on realized gains.
-
-    Args:
-        realized_gains: Total realized gains to be taxed.
-        brackets: List of (upper_bound, rate) tuples. Defaults to US-style.
+@lru_cache(maxsize=32)
+def _bracket_table(brackets: Tuple[Tuple[float, float], ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return (upper_bounds, lower_bounds, rates, tax_below) for a bracket set.
 
-    Returns:
-        Total tax amount owed.
+    ``tax_below[i]`` is the total tax owed on gains up to ``lower_bounds[i]``,
+    so the tax on ``g`` falling in bracket ``i`` is
+    ``tax_below[i] + (g - lower_bounds[i]) * rates[i]``.
     """
+    upper = np.minimum(np.array([b for b, _ in brackets], dtype=np.float64), TOP_BRACKET_BOUND)
+    rates = np.array([r for _, r in brackets], dtype=np.float64)
+    lower = np.concatenate(([0.0], upper[:-1]))
+    tax_below = np.concatenate(([0.0], np.cumsum((upper - lower) * rates)[:-1]))
+    return upper, lower, rates, tax_below
+
+
+_DEFAULT_TABLE = _bracket_table(tuple(DEFAULT_BRACKETS))
+
+
+def bracket_table(brackets: List[Tuple[float, float]] = None):
+    """(upper_bounds, lower_bounds, rates, tax_below) arrays for a bracket set."""
     if brackets is None:
-        brackets = DEFAULT_BRACKETS
+        return _DEFAULT_TABLE
+    return _bracket_table(tuple((float(b), float(r)) for b, r in brackets))
 
-    if realized_gains <= 0:
-        return 0.0
 
-    tax = 0.0
-    prev_bound = 0.0
+@njit(cache=True)
+def tax_from_table(gains, upper, lower, rates, tax_below):
+    """Progressive tax on a scalar ``gains`` for a table from bracket_table.
 
-    for upper_bound, rate in brackets:
-        if realized_gains <= prev_bound:
-            break
-        taxable_in_bracket = min(realized_gains, upper_bound) - prev_bound
-        if taxable_in_bracket > 0:
-            tax += taxable_in_bracket * rate
-        prev_bound = upper_bound
+    Compiled, so the day loop in engine._kernels calls it directly.
+    """
+    gains = max(gains, 0.0)
+    i = min(np.searchsorted(upper, gains), upper.shape[0] - 1)
+    return tax_below[i] + (gains - lower[i]) * rates[i]
 
-    return round(tax, 6)
+
+def calculate_tax_vec(realized_gains: np.ndarray, brackets: List[Tuple[float, float]] = None) -> np.ndarray:
+    """Calculate progressive tax for an array of realized gains in one pass."""
+    upper, lower, rates, tax_below = bracket_table(brackets)
+    gains = np.maximum(np.asarray(realized_gains, dtype=np.float64), 0.0)
+    i = np.minimum(np.searchsorted(upper, gains), len(upper) - 1)
+    return tax_below[i] + (gains - lower[i]) * rates[i]
+
+
+def calculate_tax(realized_gains: Union[float, np.ndarray],
+                  brackets: List[Tuple[float, float]] = None) -> Union[float, np.ndarray]:
+    """Calculate progressive tax on realized gains.
+
+    Args:
+        realized_gains: Total realized gains to be taxed, as a scalar or array.
+        brackets: List of (upper_bound, rate) tuples. Defaults to US-style.
+
+    Returns:
+        Total tax amount owed (an array when given an array).
+    """
+    if np.ndim(realized_gains):
+        return calculate_tax_vec(realized_gains, brackets)
+    return float(tax_from_table(float(realized_gains), *bracket_table(brackets)))
 
 
 def calculate_marginal_tax(amount: float, existing_gains: float,
                            brackets: List[Tuple[float, float]] = None) -> float:
     """Calculate tax on an additional amount given existing realized gains."""
-    if brackets is None:
-        brackets = DEFAULT_BRACKETS
-    total_tax = calculate_tax(existing_gains + amount, brackets)
-    existing_tax = calculate_tax(existing_gains, brackets)
-    return round(total_tax - existing_tax, 6)
+    table = bracket_table(brackets)
+    total_tax = tax_from_table(float(existing_gains + amount), *table)
+    existing_tax = tax_from_table(float(existing_gains), *table)
+    return float(total_tax - existing_tax)
@@ -349,16 +349,17 @@ function renderResults(data) {
     setCardValue('summSRI', s.shock_resilience_index + ' / 100', s.shock_resilience_index >= 60 ? 'val-positive' : 'val-negative');
 
     // Charts
-    renderBalanceChart(data.daily_data);
-    renderNetWorthChart(data.daily_data);
-    renderCreditChart(data.daily_data);
-    renderAssetsChart(data.daily_data);
+    const dailyData = columnsToRows(data.daily_data);
+    renderBalanceChart(dailyData);
+    renderNetWorthChart(dailyData);
+    renderCreditChart(dailyData);
+    renderAssetsChart(dailyData);
 
     // Events
     renderEvents(data.events);
 
     // Update branch day max
-    document.getElementById('branchDay').max = data.daily_data.length - 1;
+    document.getElementById('branchDay').max = dailyData.length - 1;
 }
 
 function setCardValue(id, value, className) {
@@ -374,6 +375,20 @@ function formatMoney(val) {
 }
 
 // ==================== CHART RENDERERS ====================
+// Daily series arrive column-major ({day: [...], balance: [...]}); turn them into row objects
+function columnsToRows(columns) {
+    if (!columns) return [];
+    const keys = Object.keys(columns);
+    const n = keys.length ? columns[keys[0]].length : 0;
+    const rows = new Array(n);
+    for (let i = 0; i < n; i++) {
+        const row = {};
+        for (const k of keys) row[k] = columns[k][i];
+        rows[i] = row;
+    }
+    return rows;
+}
+
 function sampleData(arr, maxPoints) {
     if (arr.length <= maxPoints) return arr;
     const step = Math.ceil(arr.length / maxPoints);
@@ -585,8 +600,8 @@ function renderBranchResults(data) {
     const branchResults = document.getElementById('branchResults');
     if (branchResults) branchResults.style.display = '';
 
-    const origDaily = data.original_daily || [];
-    const branchDaily = data.branched_daily || [];
+    const origDaily = columnsToRows(data.original_daily);
+    const branchDaily = columnsToRows(data.branched_daily);
 
     const maxLen = Math.max(origDaily.length, branchDaily.length);
     const sOrig = sampleData(origDaily, 400);